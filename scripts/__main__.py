@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the Python tournament tools.
+
+Usage (from the repository root):
+    python3 scripts <command> [args]
+
+Commands:
+    convert         Convert one parsed replay to OpenDota format
+    batch-convert   Convert every parsed replay in a directory
+    probe           Summarize a parsed replay without converting it
+    fetch-league    Fetch league match ids from the Steam API
+    fetch-match     Fetch a full match object from OpenDota
+    encode-sa       Base64-encode a Firebase service account file
+    leaderboard     Maintain the incremental fantasy leaderboard
+
+Only argparse is imported up front. Each command imports its module (and
+requests/dotenv for the network commands) when it runs, so short scripted
+calls from cron or Node don't pay for dependencies they never use.
+"""
+
+import argparse
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Support `python3 -m scripts` as well as `python3 scripts`
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+
+def cmd_convert(args) -> int:
+    from convert_parsed_to_opendota import convert_file
+    try:
+        convert_file(args.file, args.output)
+    except Exception as e:
+        print(f"Error converting file: {e}")
+        return 1
+    return 0
+
+
+def cmd_batch_convert(args) -> int:
+    from convert_parsed_to_opendota import convert_file, default_output_path
+
+    files = sorted(
+        os.path.join(args.directory, name) for name in os.listdir(args.directory)
+        if name.endswith('.json') and not name.endswith('_opendota.json')
+    )
+    converted = skipped = failed = 0
+    for file_path in files:
+        output_file = default_output_path(file_path)
+        if not args.force and os.path.exists(output_file) and os.path.getmtime(output_file) >= os.path.getmtime(file_path):
+            skipped += 1
+            continue
+        try:
+            convert_file(file_path, output_file)
+            converted += 1
+        except Exception as e:
+            print(f"Error converting {file_path}: {e}")
+            failed += 1
+
+    print(f"Batch conversion done: {converted} converted, {skipped} up to date, {failed} failed")
+    return 1 if failed else 0
+
+
+def cmd_probe(args) -> int:
+    import json
+    from convert_parsed_to_opendota import probe_replay_file
+    try:
+        summary = probe_replay_file(args.file)
+    except Exception as e:
+        print(f"Error probing file: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+def cmd_fetch_league(args) -> int:
+    from fetch_league_games import main
+    return main(league_id=args.league_id, matches_requested=args.matches)
+
+
+def cmd_fetch_match(args) -> int:
+    from fetch_opendota_match import fetch_match
+    return 0 if fetch_match(args.match_id, args.output) else 1
+
+
+def cmd_encode_sa(args) -> int:
+    from encode_sa import encode_service_account
+    return 0 if encode_service_account(args.file) else 1
+
+
+def cmd_leaderboard(args) -> int:
+    import json
+    from fantasy_leaderboard import FantasyLeaderboard, load_match
+
+    leaderboard = FantasyLeaderboard(args.state)
+
+    if args.action == 'show':
+        print(json.dumps({
+            'players': leaderboard.player_standings(),
+            'lineups': leaderboard.lineup_standings()
+        }, indent=2))
+        return 0
+
+    failed = False
+    if args.action == 'ingest':
+        for file_path in args.files:
+            try:
+                match = load_match(file_path)
+                deltas = leaderboard.apply_match(match, args.round)
+            except Exception as e:
+                print(f"Error ingesting {file_path}: {e}")
+                failed = True
+                continue
+            print(f"Match {match.get('match_id')}: updated {len(deltas)} players")
+    elif args.action == 'remove':
+        deltas = leaderboard.remove_match(args.match_id)
+        print(f"Match {args.match_id}: rolled back {len(deltas)} players")
+    elif args.action == 'roles':
+        with open(args.file, 'r') as f:
+            roles = json.load(f)
+        for account_id, role in roles.items():
+            leaderboard.set_player_role(account_id, role)
+        print(f"Set roles for {len(roles)} players")
+    elif args.action == 'lineups':
+        with open(args.file, 'r') as f:
+            lineups = json.load(f)
+        for lineup_id, rounds in lineups.items():
+            for round_id, account_ids in rounds.items():
+                leaderboard.set_lineup(lineup_id, round_id, account_ids)
+        print(f"Registered {len(lineups)} lineups")
+
+    leaderboard.save()
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='scripts', description='Python tournament tools')
+    subparsers = parser.add_subparsers(dest='command', metavar='<command>')
+    subparsers.required = True
+
+    convert = subparsers.add_parser('convert', help='Convert one parsed replay to OpenDota format')
+    convert.add_argument('file', help='Parsed replay file (<match_id>.json)')
+    convert.add_argument('-o', '--output', help='Output path (default: <match_id>_opendota.json)')
+    convert.set_defaults(func=cmd_convert)
+
+    batch_convert = subparsers.add_parser('batch-convert', help='Convert every parsed replay in a directory')
+    batch_convert.add_argument('directory', help='Directory of parsed replay files')
+    batch_convert.add_argument('--force', action='store_true', help='Reconvert files whose output is up to date')
+    batch_convert.set_defaults(func=cmd_batch_convert)
+
+    probe = subparsers.add_parser('probe', help='Summarize a parsed replay without converting it')
+    probe.add_argument('file', help='Parsed replay file')
+    probe.set_defaults(func=cmd_probe)
+
+    # League default lives in fetch_league_games.LEAGUE_ID; repeated here so --help stays import-free
+    fetch_league = subparsers.add_parser('fetch-league', help='Fetch league match ids from the Steam API')
+    fetch_league.add_argument('--league-id', type=int, default=18559, help='League id (default: 18559)')
+    fetch_league.add_argument('--matches', type=int, default=100, help='Number of matches to request')
+    fetch_league.set_defaults(func=cmd_fetch_league)
+
+    fetch_match = subparsers.add_parser('fetch-match', help='Fetch a full match object from OpenDota')
+    fetch_match.add_argument('match_id', type=int, help='Dota 2 match id')
+    fetch_match.add_argument('-o', '--output', help='Output path (default: opendota_match_<id>.json)')
+    fetch_match.set_defaults(func=cmd_fetch_match)
+
+    encode_sa = subparsers.add_parser('encode-sa', help='Base64-encode a Firebase service account file')
+    encode_sa.add_argument('file', help='Service account JSON file')
+    encode_sa.set_defaults(func=cmd_encode_sa)
+
+    leaderboard = subparsers.add_parser('leaderboard', help='Maintain the incremental fantasy leaderboard')
+    leaderboard.add_argument('state', help='Leaderboard state file (match records go in <state>_matches/)')
+    actions = leaderboard.add_subparsers(dest='action', metavar='<action>')
+    actions.required = True
+    ingest = actions.add_parser('ingest', help='Apply (or re-apply) converted or parsed matches')
+    ingest.add_argument('files', nargs='+', help='<match_id>_opendota.json or parsed <match_id>.json files')
+    ingest.add_argument('--round', help='Round to score the matches in (default: read from the match, else group_stage)')
+    remove = actions.add_parser('remove', help='Roll back a previously applied match')
+    remove.add_argument('match_id', help='Match id')
+    roles = actions.add_parser('roles', help='Set player roles from {account_id: role}')
+    roles.add_argument('file', help='Roles JSON file')
+    lineups = actions.add_parser('lineups', help='Set lineups from {lineup_id: {round_id: [account_id, ...]}}')
+    lineups.add_argument('file', help='Lineups JSON file')
+    actions.add_parser('show', help='Print player and lineup standings')
+    leaderboard.set_defaults(func=cmd_leaderboard)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Startup-time guard for the tools CLI (python3 scripts <command>).
+
+Runs short CLI invocations in fresh interpreters and fails if:
+  - the fastest run exceeds a bare interpreter start by more than the budget,
+  - an offline command imports one of the network dependencies, or
+  - probe/convert fail on a tiny fixture replay (probe must print valid JSON).
+
+probe and convert run against a ten-player fixture written to a temp dir, so
+the converter and reference index imports are part of what is measured. Each
+command is run once before timing so bytecode is cached, as on a deployed box.
+
+Usage: python3 scripts/bench_cli_startup.py [--runs N] [--budget-ms MS]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+NETWORK_MODULES = {'requests', 'dotenv', 'urllib3'}
+
+# Bytecode must be writable for the warm-up run to populate __pycache__
+BENCH_ENV = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+
+
+def write_fixture_replay(directory: str) -> str:
+    """Write a minimal parsed replay (slots, intervals, a few combat events, epilogue)."""
+    heroes = ['npc_dota_hero_antimage', 'npc_dota_hero_axe', 'npc_dota_hero_puck', 'npc_dota_hero_lion',
+              'npc_dota_hero_wisp', 'npc_dota_hero_pudge', 'npc_dota_hero_sven', 'npc_dota_hero_lina',
+              'npc_dota_hero_zuus', 'npc_dota_hero_furion']
+    events = [{'type': 'player_slot', 'key': str(slot), 'value': slot} for slot in range(10)]
+    for time_s in (0, 600, 1200):
+        for slot in range(10):
+            events.append({'type': 'interval', 'time': time_s, 'slot': slot, 'kills': time_s // 600,
+                           'deaths': 1, 'assists': 2, 'gold': 500, 'xp': time_s * 10, 'networth': time_s * 8,
+                           'lh': time_s // 10, 'denies': 1, 'level': 10})
+        events.append({'type': 'DOTA_COMBATLOG_DAMAGE', 'time': time_s, 'attackername': heroes[0],
+                       'targetname': heroes[5], 'targethero': True, 'value': 100})
+        events.append({'type': 'DOTA_COMBATLOG_PURCHASE', 'time': time_s, 'targetname': heroes[2],
+                       'valuename': 'item_blink', 'value': 0})
+    players = [{'steamid_': 76561197960265728 + slot, 'playerName_': {'bytes': list(f'p{slot}'.encode())},
+                'heroName_': {'bytes': list(hero.encode())}, 'gameTeam_': 2 if slot < 5 else 3}
+               for slot, hero in enumerate(heroes)]
+    events.append({'type': 'epilogue', 'time': 1200,
+                   'key': json.dumps({'gameInfo_': {'dota_': {'playerInfo_': players}}})})
+
+    path = os.path.join(directory, '1.json')
+    with open(path, 'w') as f:
+        for event in events:
+            f.write(json.dumps(event) + '\n')
+    return path
+
+
+def time_command(argv: List[str], runs: int) -> float:
+    """Fastest wall time in milliseconds for running argv in a fresh interpreter.
+
+    The minimum is used rather than the median: startup cost is a floor, and
+    everything above it is scheduler noise from whatever else the box is doing.
+    """
+    subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=BENCH_ENV)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=BENCH_ENV)
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples)
+
+
+def imported_modules(argv: List[str]) -> set:
+    """Top-level package names imported while running argv, from -X importtime."""
+    result = subprocess.run(argv[:1] + ['-X', 'importtime'] + argv[1:],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=BENCH_ENV)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            name = line.rsplit('|', 1)[1].strip()
+            modules.add(name.split('.')[0])
+    return modules
+
+
+def offline_commands(fixture: str, output: str) -> Dict[str, List[str]]:
+    """Invocations that must stay offline. A missing file exercises encode-sa's handler cheaply."""
+    return {
+        '--help': ['--help'],
+        'probe': ['probe', fixture],
+        'convert': ['convert', fixture, '-o', output],
+        'encode-sa': ['encode-sa', os.path.join(SCRIPTS_DIR, 'does-not-exist.json')],
+        'leaderboard show': ['leaderboard', os.path.join(os.path.dirname(output), 'leaderboard.json'), 'show'],
+    }
+
+
+def check_fixture_commands(fixture: str, output: str) -> List[str]:
+    """probe and convert must succeed on the fixture, and probe's stdout must be pure JSON."""
+    failures = []
+    probe = subprocess.run([sys.executable, SCRIPTS_DIR, 'probe', fixture],
+                           capture_output=True, text=True, env=BENCH_ENV)
+    try:
+        json.loads(probe.stdout)
+    except json.JSONDecodeError:
+        failures.append("'probe' stdout is not valid JSON")
+    if probe.returncode != 0:
+        failures.append(f"'probe' exited with {probe.returncode}")
+
+    convert = subprocess.run([sys.executable, SCRIPTS_DIR, 'convert', fixture, '-o', output],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=BENCH_ENV)
+    if convert.returncode != 0 or not os.path.exists(output):
+        failures.append(f"'convert' failed on the fixture (exit {convert.returncode})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Guard the cold start of the tools CLI')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=40.0,
+                        help='Allowed overhead over a bare interpreter start')
+    args = parser.parse_args()
+
+    baseline = time_command([sys.executable, '-c', 'pass'], args.runs)
+    print(f"Bare interpreter: {baseline:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixture = write_fixture_replay(tmp_dir)
+        output = os.path.join(tmp_dir, 'out_opendota.json')
+
+        failures = check_fixture_commands(fixture, output)
+        for label, command in offline_commands(fixture, output).items():
+            argv = [sys.executable, SCRIPTS_DIR] + command
+            elapsed = time_command(argv, args.runs)
+            overhead = elapsed - baseline
+            print(f"scripts {label}: {elapsed:.1f} ms (+{overhead:.1f} ms)")
+            if overhead > args.budget_ms:
+                failures.append(f"'{label}' took +{overhead:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+            leaked = imported_modules(argv) & NETWORK_MODULES
+            if leaked:
+                failures.append(f"'{label}' imported {', '.join(sorted(leaked))}")
+
+    if failures:
+        print("\nStartup check failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nStartup check passed")
+
+
+if __name__ == "__main__":
+    main()
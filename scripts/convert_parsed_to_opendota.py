@@ -8,11 +8,77 @@ to the OpenDota API match format that the tournament system expects.
 
 import json
 import sys
+from array import array
 from typing import Dict, List, Any, Optional
 from collections import defaultdict
 
-def parse_replay_file(file_path: str) -> List[Dict[str, Any]]:
-    """Parse the line-by-line JSON file into a list of events."""
+from reference_data import get_reference_index, normalize_item_name
+
+def log(message: str):
+    """Progress and diagnostics go to stderr so stdout stays clean for JSON output (e.g. probe)."""
+    print(message, file=sys.stderr)
+
+# Fields the extract stages read from combat log events. Everything else on a
+# combat log line is dropped at parse time.
+EVENT_STRING_FIELDS = ('type', 'attackername', 'targetname', 'inflictor', 'valuename')
+
+# Non-combat events whose remaining fields are needed later (final interval
+# stats, epilogue metadata). These keep their raw dict in ReplayEvent.extra.
+EVENT_TYPES_WITH_EXTRA = {'interval', 'epilogue', 'player_slot'}
+
+# hero_inventory slot index (OpenDota parser interval records) -> OpenDota player field.
+# 0-5 are the main inventory, 6-8 the backpack and 16 the neutral item slot.
+INVENTORY_SLOT_FIELDS = {
+    0: 'item_0', 1: 'item_1', 2: 'item_2', 3: 'item_3', 4: 'item_4', 5: 'item_5',
+    6: 'backpack_0', 7: 'backpack_1', 8: 'backpack_2',
+    16: 'item_neutral'
+}
+
+
+class ReplayEvent:
+    """Compact replay event.
+
+    A replay holds millions of events, and a dict per event costs several
+    times more memory than a slotted object. Repeated strings (hero, ability
+    and item names) are interned so every event shares the same objects.
+    """
+
+    __slots__ = ('type', 'time', 'slot', 'attackername', 'targetname', 'inflictor',
+                 'valuename', 'value', 'targethero', 'key', 'extra')
+
+    def __init__(self, raw: Dict[str, Any]):
+        intern = sys.intern
+        for field in EVENT_STRING_FIELDS:
+            value = raw.get(field)
+            setattr(self, field, intern(value) if isinstance(value, str) else value)
+        self.time = raw.get('time', 0)
+        self.slot = raw.get('slot')
+        self.value = raw.get('value', 0)
+        self.targethero = raw.get('targethero', False)
+        self.key = raw.get('key')
+        self.extra = raw if self.type in EVENT_TYPES_WITH_EXTRA else None
+
+
+class NameTable:
+    """Interns item and ability names to small ints for the per-player id arrays."""
+
+    __slots__ = ('ids', 'names')
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def intern(self, name: str) -> int:
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.ids[name] = name_id
+            self.names.append(name)
+        return name_id
+
+
+def parse_replay_file(file_path: str) -> List[ReplayEvent]:
+    """Parse the line-by-line JSON file into a list of compact events."""
     events = []
     with open(file_path, 'r') as f:
         for line in f:
@@ -20,34 +86,34 @@ def parse_replay_file(file_path: str) -> List[Dict[str, Any]]:
             if line:
                 try:
                     event = json.loads(line)
-                    events.append(event)
+                    events.append(ReplayEvent(event))
                 except json.JSONDecodeError as e:
-                    print(f"Warning: Failed to parse line: {line[:100]}... Error: {e}")
+                    log(f"Warning: Failed to parse line: {line[:100]}... Error: {e}")
                     continue
     return events
 
-def extract_player_info_from_epilogue(events: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+def extract_player_info_from_epilogue(events: List[ReplayEvent]) -> Dict[int, Dict[str, Any]]:
     """Extract player information from the epilogue event."""
     player_info = {}
     
     # Find epilogue event (usually the last event)
     epilogue_event = None
     for event in reversed(events):  # Search from the end
-        if event.get('type') == 'epilogue':
+        if event.type == 'epilogue':
             epilogue_event = event
             break
     
     if not epilogue_event:
-        print("Warning: No epilogue event found, player identification will be limited")
+        log("Warning: No epilogue event found, player identification will be limited")
         return {}
     
     try:
         # Parse the epilogue key which contains match metadata
-        epilogue_data = json.loads(epilogue_event.get('key', '{}'))
+        epilogue_data = json.loads(epilogue_event.key or '{}')
         game_info = epilogue_data.get('gameInfo_', {}).get('dota_', {})
         player_info_list = game_info.get('playerInfo_', [])
         
-        print(f"Found {len(player_info_list)} players in epilogue data")
+        log(f"Found {len(player_info_list)} players in epilogue data")
         
         for i, player_data in enumerate(player_info_list):
             # Convert Steam64 to Steam32
@@ -94,7 +160,7 @@ def extract_player_info_from_epilogue(events: List[Dict[str, Any]]) -> Dict[int,
             # Safe print for console output
             safe_player_name = player_name.encode('ascii', errors='replace').decode('ascii') if player_name else 'Unknown'
             safe_hero_name = hero_name.encode('ascii', errors='replace').decode('ascii') if hero_name else 'Unknown'
-            print(f"Player {slot}: {safe_player_name} (Steam32: {steam32}, Hero: {safe_hero_name})")
+            log(f"Player {slot}: {safe_player_name} (Steam32: {steam32}, Hero: {safe_hero_name})")
         
         # Extract team information
         radiant_team_id = game_info.get('radiantTeamId_')
@@ -107,7 +173,7 @@ def extract_player_info_from_epilogue(events: List[Dict[str, Any]]) -> Dict[int,
         dire_tag_bytes = game_info.get('direTeamTag_', {}).get('bytes', [])
         dire_tag = ''.join(chr(b) if b >= 0 else chr(256 + b) for b in dire_tag_bytes) if dire_tag_bytes else None
         
-        print(f"Teams: Radiant ID {radiant_team_id} ('{radiant_tag}') vs Dire ID {dire_team_id} ('{dire_tag}')")
+        log(f"Teams: Radiant ID {radiant_team_id} ('{radiant_tag}') vs Dire ID {dire_team_id} ('{dire_tag}')")
         
         # Store team info in a special key
         player_info['_team_info'] = {
@@ -118,22 +184,24 @@ def extract_player_info_from_epilogue(events: List[Dict[str, Any]]) -> Dict[int,
         }
         
     except (json.JSONDecodeError, KeyError, TypeError) as e:
-        print(f"Warning: Failed to parse epilogue data: {e}")
+        log(f"Warning: Failed to parse epilogue data: {e}")
     
     return player_info
 
-def extract_player_slots(events: List[Dict[str, Any]]) -> Dict[int, int]:
+def extract_player_slots(events: List[ReplayEvent]) -> Dict[int, int]:
     """Extract player slot assignments from events."""
     player_slots = {}
     for event in events:
-        if event.get('type') == 'player_slot':
-            player_id = int(event.get('key', -1))
-            slot = int(event.get('value', -1))
+        if event.type == 'player_slot':
+            # Read the raw dict: ReplayEvent.value defaults to 0 for combat
+            # events, which would turn a missing slot into slot 0
+            player_id = int(event.extra.get('key', -1))
+            slot = int(event.extra.get('value', -1))
             if player_id >= 0 and slot >= 0:
                 player_slots[player_id] = slot
     return player_slots
 
-def extract_combat_stats(events: List[Dict[str, Any]], player_info: Dict[int, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+def extract_combat_stats(events: List[ReplayEvent], player_info: Dict[int, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     """Extract combat statistics from DOTA_COMBATLOG events."""
     # Map hero names to player slots for combat event attribution
     hero_to_slot = {}
@@ -154,24 +222,34 @@ def extract_combat_stats(events: List[Dict[str, Any]], player_info: Dict[int, Di
             'ability_uses': {},
             'item_uses': {},
             'damage_taken': {},
-            'heal_targets': {}
+            'heal_targets': {},
+            # Purchases as two parallel arrays (time, interned item id)
+            'purchase_times': array('i'),
+            'purchase_items': array('i'),
+            # Interned ability ids in the order they were skilled
+            'ability_upgrades': array('i')
         }
     
-    print("Processing combat events...")
+    # Shared by all players, stored under a special key like player_info['_team_info']
+    names = NameTable()
+    combat_stats['_names'] = names
+    
+    log("Processing combat events...")
     damage_events = 0
     heal_events = 0
     purchase_events = 0
     ability_events = 0
+    upgrade_events = 0
     
     for event in events:
-        event_type = event.get('type')
+        event_type = event.type
         
         # Process damage events
         if event_type == 'DOTA_COMBATLOG_DAMAGE':
             damage_events += 1
-            attacker = event.get('attackername')
-            target = event.get('targetname')
-            damage_value = event.get('value', 0)
+            attacker = event.attackername
+            target = event.targetname
+            damage_value = event.value
             
             # Find attacker slot
             attacker_slot = hero_to_slot.get(attacker)
@@ -179,9 +257,9 @@ def extract_combat_stats(events: List[Dict[str, Any]], player_info: Dict[int, Di
             
             if attacker_slot is not None:
                 # Add damage dealt
-                if event.get('targethero', False):
+                if event.targethero:
                     combat_stats[attacker_slot]['hero_damage'] += damage_value
-                elif 'tower' in target.lower() or 'barracks' in target.lower():
+                elif target and ('tower' in target.lower() or 'barracks' in target.lower()):
                     combat_stats[attacker_slot]['tower_damage'] += damage_value
             
             if target_slot is not None:
@@ -193,9 +271,9 @@ def extract_combat_stats(events: List[Dict[str, Any]], player_info: Dict[int, Di
         # Process healing events
         elif event_type == 'DOTA_COMBATLOG_HEAL':
             heal_events += 1
-            healer = event.get('attackername')
-            target = event.get('targetname')
-            heal_value = event.get('value', 0)
+            healer = event.attackername
+            target = event.targetname
+            heal_value = event.value
             
             healer_slot = hero_to_slot.get(healer)
             target_slot = hero_to_slot.get(target)
@@ -211,18 +289,24 @@ def extract_combat_stats(events: List[Dict[str, Any]], player_info: Dict[int, Di
         # Process purchase events for gold spent
         elif event_type == 'DOTA_COMBATLOG_PURCHASE':
             purchase_events += 1
-            target = event.get('targetname')
-            cost = event.get('value', 0)
+            target = event.targetname
+            cost = event.value
+            item = event.valuename
             
             target_slot = hero_to_slot.get(target)
             if target_slot is not None:
-                combat_stats[target_slot]['gold_spent'] += cost
+                player_combat = combat_stats[target_slot]
+                player_combat['gold_spent'] += cost
+                if item:
+                    item_id = names.intern(item)
+                    player_combat['purchase_times'].append(int(event.time))
+                    player_combat['purchase_items'].append(item_id)
         
         # Process ability usage events
         elif event_type == 'DOTA_COMBATLOG_ABILITY':
             ability_events += 1
-            caster = event.get('attackername')
-            ability = event.get('inflictor')
+            caster = event.attackername
+            ability = event.inflictor
             
             caster_slot = hero_to_slot.get(caster)
             if caster_slot is not None and ability:
@@ -232,33 +316,43 @@ def extract_combat_stats(events: List[Dict[str, Any]], player_info: Dict[int, Di
         
         # Process item usage events
         elif event_type == 'DOTA_COMBATLOG_ITEM':
-            user = event.get('attackername')
-            item = event.get('inflictor')
+            user = event.attackername
+            item = event.inflictor
             
             user_slot = hero_to_slot.get(user)
             if user_slot is not None and item:
                 if item not in combat_stats[user_slot]['item_uses']:
                     combat_stats[user_slot]['item_uses'][item] = 0
                 combat_stats[user_slot]['item_uses'][item] += 1
+        
+        # Process ability upgrades (skill point spent)
+        elif event_type == 'DOTA_ABILITY_LEVEL':
+            upgrade_events += 1
+            hero = event.targetname
+            ability = event.valuename
+            
+            hero_slot = hero_to_slot.get(hero)
+            if hero_slot is not None and ability:
+                combat_stats[hero_slot]['ability_upgrades'].append(names.intern(ability))
     
-    print(f"Processed {damage_events} damage, {heal_events} healing, {purchase_events} purchase, {ability_events} ability events")
+    log(f"Processed {damage_events} damage, {heal_events} healing, {purchase_events} purchase, {ability_events} ability, {upgrade_events} ability upgrade events")
     return combat_stats
 
-def get_final_player_stats(events: List[Dict[str, Any]], player_slots: Dict[int, int]) -> Dict[int, Dict[str, Any]]:
+def get_final_player_stats(events: List[ReplayEvent], player_slots: Dict[int, int]) -> Dict[int, Dict[str, Any]]:
     """Extract final statistics for each player from interval events."""
     # Find the last interval event for each player
     final_stats = {}
     
     for event in events:
-        if event.get('type') == 'interval':
-            slot = event.get('slot')
+        if event.type == 'interval':
+            slot = event.slot
             if slot is not None:
                 # Keep updating with each interval event - the last one will be the final stats
-                final_stats[slot] = event
+                final_stats[slot] = event.extra
     
     return final_stats
 
-def calculate_game_metadata(events: List[Dict[str, Any]], final_stats: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+def calculate_game_metadata(events: List[ReplayEvent], final_stats: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
     """Calculate game duration, winner, and other metadata."""
     # Find the latest timestamp to determine game duration
     max_time = 0
@@ -267,14 +361,14 @@ def calculate_game_metadata(events: List[Dict[str, Any]], final_stats: Dict[int,
     game_start_time = None
     
     for event in events:
-        time = event.get('time', 0)
+        time = event.time
         if time > max_time:
             max_time = time
         if time < min_time:
             min_time = time
             
         # Find first blood
-        if event.get('type') == 'DOTA_COMBATLOG_FIRST_BLOOD' and first_blood_time is None:
+        if event.type == 'DOTA_COMBATLOG_FIRST_BLOOD' and first_blood_time is None:
             first_blood_time = max(0, time)  # Convert to positive game time
         
         # Find game start (when time goes from negative to positive)
@@ -303,6 +397,56 @@ def calculate_game_metadata(events: List[Dict[str, Any]], final_stats: Dict[int,
         'picks_bans': []  # Not available in parsed data
     }
 
+def expand_purchases(player_combat: Dict[str, Any], names: NameTable) -> Dict[str, Any]:
+    """Expand the compact purchase arrays into OpenDota purchase_log/first_purchase_time/purchase."""
+    purchase_log = []
+    first_purchase_time = {}
+    purchase_counts = {}
+    for time, item_id in zip(player_combat.get('purchase_times', ()), player_combat.get('purchase_items', ())):
+        key = normalize_item_name(names.names[item_id])
+        purchase_log.append({'time': time, 'key': key})
+        if key not in first_purchase_time:
+            first_purchase_time[key] = time
+        purchase_counts[key] = purchase_counts.get(key, 0) + 1
+    return {
+        'purchase_log': purchase_log,
+        'first_purchase_time': first_purchase_time,
+        'purchase': purchase_counts
+    }
+
+def expand_ability_upgrades(player_combat: Dict[str, Any], names: NameTable) -> List[int]:
+    """Map interned ability names to OpenDota ability ids, skipping unknown abilities.
+
+    Needs ability_ids.json (scripts/fetch-reference-constants.js); without it
+    every ability is unknown and the result is empty.
+    """
+    reference_index = get_reference_index()
+    upgrades = []
+    for ability in player_combat.get('ability_upgrades', ()):
+        ability_id = reference_index.ability_id(names.names[ability])
+        if ability_id is not None:
+            upgrades.append(ability_id)
+    return upgrades
+
+def expand_final_inventory(stats: Dict[str, Any]) -> Dict[str, int]:
+    """Map the last interval's hero_inventory to OpenDota item slot ids.
+
+    Entries are {'id': 'item_blink', 'slot': 0, ...}; entries without a slot
+    take their list position. Slots that are empty, unknown to item_ids.json or
+    missing because the interval has no hero_inventory stay 0.
+    """
+    reference_index = get_reference_index()
+    inventory = {field: 0 for field in INVENTORY_SLOT_FIELDS.values()}
+    for position, item in enumerate(stats.get('hero_inventory') or ()):
+        if isinstance(item, dict):
+            name, slot = item.get('id'), item.get('slot', position)
+        else:
+            name, slot = item, position
+        field = INVENTORY_SLOT_FIELDS.get(slot)
+        if field and isinstance(name, str):
+            inventory[field] = reference_index.item_id(name)
+    return inventory
+
 def convert_player_stats(slot: int, stats: Dict[str, Any], player_slots: Dict[int, int], match_metadata: Dict[str, Any], player_info: Dict[int, Dict[str, Any]] = None, combat_stats: Dict[int, Dict[str, Any]] = None) -> Dict[str, Any]:
     """Convert interval stats to OpenDota player format."""
     # Map slot to player_slot (0-4 for radiant, 128-132 for dire)
@@ -334,19 +478,35 @@ def convert_player_stats(slot: int, stats: Dict[str, Any], player_slots: Dict[in
     # Get combat stats if available
     player_combat = combat_stats.get(slot, {}) if combat_stats else {}
     
+    # Resolve hero id from the epilogue hero name (e.g. npc_dota_hero_antimage)
+    hero_id = get_reference_index().hero_id(player_data.get('hero_name'))
+    
+    # Expand the compact purchase/upgrade arrays into OpenDota shapes
+    names = combat_stats.get('_names') if combat_stats else None
+    if names is not None:
+        purchases = expand_purchases(player_combat, names)
+        ability_upgrades = expand_ability_upgrades(player_combat, names)
+    else:
+        purchases = {'purchase_log': [], 'first_purchase_time': {}, 'purchase': {}}
+        ability_upgrades = []
+    
+    # End-of-game item slots from the last interval
+    inventory = expand_final_inventory(stats)
+    
     return {
         # Core player identification (now from epilogue data)
         'account_id': player_data.get('account_id'),  # Steam32 ID from epilogue
         'player_slot': player_slot,
         'team_number': team_number,
         'team_slot': team_slot,
-        'hero_id': None,  # Unknown from replay data
+        'hero_id': hero_id,
         'hero_variant': 1,  # Default
         
-        # Items
-        'item_0': 0, 'item_1': 0, 'item_2': 0, 'item_3': 0, 'item_4': 0, 'item_5': 0,
-        'backpack_0': 0, 'backpack_1': 0, 'backpack_2': 0,
-        'item_neutral': 0,
+        # Items (final inventory from the last interval, 0 for empty slots)
+        'item_0': inventory['item_0'], 'item_1': inventory['item_1'], 'item_2': inventory['item_2'],
+        'item_3': inventory['item_3'], 'item_4': inventory['item_4'], 'item_5': inventory['item_5'],
+        'backpack_0': inventory['backpack_0'], 'backpack_1': inventory['backpack_1'], 'backpack_2': inventory['backpack_2'],
+        'item_neutral': inventory['item_neutral'],
         'item_neutral2': 0,
         
         # Core stats
@@ -391,7 +551,12 @@ def convert_player_stats(slot: int, stats: Dict[str, Any], player_slots: Dict[in
         'observers_placed': stats.get('observers_placed', 0),
         
         # Ability upgrades
-        'ability_upgrades_arr': [],  # Not available
+        'ability_upgrades_arr': ability_upgrades,
+        
+        # Item timings (from purchase events)
+        'purchase_log': purchases['purchase_log'],
+        'first_purchase_time': purchases['first_purchase_time'],
+        'purchase': purchases['purchase'],
         
         # Combat event statistics (additional fields)
         'ability_uses': player_combat.get('ability_uses', {}),
@@ -431,23 +596,32 @@ def convert_player_stats(slot: int, stats: Dict[str, Any], player_slots: Dict[in
 
 def convert_to_opendota_format(file_path: str) -> Dict[str, Any]:
     """Main conversion function."""
-    print(f"Parsing replay file: {file_path}")
+    log(f"Parsing replay file: {file_path}")
     events = parse_replay_file(file_path)
-    print(f"Parsed {len(events)} events")
+    log(f"Parsed {len(events)} events")
     
     # Extract player information from epilogue
     player_info = extract_player_info_from_epilogue(events)
     
     # Extract player assignments
     player_slots = extract_player_slots(events)
-    print(f"Found player slots: {player_slots}")
+    log(f"Found player slots: {player_slots}")
     
     # Extract combat statistics
     combat_stats = extract_combat_stats(events, player_info)
+    if not get_reference_index().ability_ids and any(
+            combat_stats[slot]['ability_upgrades'] for slot in range(10)):
+        log("Warning: ability_ids.json missing, ability_upgrades_arr will be empty "
+            "(run node scripts/fetch-reference-constants.js)")
     
     # Get final player statistics
     final_stats = get_final_player_stats(events, player_slots)
-    print(f"Extracted stats for {len(final_stats)} players")
+    log(f"Extracted stats for {len(final_stats)} players")
+    if not any(stats.get('hero_inventory') for stats in final_stats.values()):
+        log("Warning: No hero_inventory in interval events, item slots will be empty")
+    elif not get_reference_index().item_ids:
+        log("Warning: item_ids.json missing, item slots will be empty "
+            "(run node scripts/fetch-reference-constants.js)")
     
     # Calculate game metadata
     metadata = calculate_game_metadata(events, final_stats)
@@ -527,6 +701,49 @@ def convert_to_opendota_format(file_path: str) -> Dict[str, Any]:
     
     return opendota_match
 
+def default_output_path(input_file: str) -> str:
+    """Converted files sit next to their source as <match_id>_opendota.json."""
+    return input_file.replace('.json', '_opendota.json')
+
+def convert_file(input_file: str, output_file: Optional[str] = None) -> Dict[str, Any]:
+    """Convert a parsed replay file and write the OpenDota JSON next to it (or to output_file)."""
+    converted_data = convert_to_opendota_format(input_file)
+    
+    output_file = output_file or default_output_path(input_file)
+    with open(output_file, 'w') as f:
+        json.dump(converted_data, f, indent=2)
+    
+    print(f"Conversion complete! Output saved to: {output_file}")
+    print(f"Match ID: {converted_data['match_id']}")
+    print(f"Duration: {converted_data['duration']} seconds")
+    print(f"Radiant Win: {converted_data['radiant_win']}")
+    print(f"Players: {len(converted_data['players'])}")
+    return converted_data
+
+def probe_replay_file(file_path: str) -> Dict[str, Any]:
+    """Summarize a parsed replay (event counts, players, duration) without converting it."""
+    events = parse_replay_file(file_path)
+    player_info = extract_player_info_from_epilogue(events)
+    final_stats = get_final_player_stats(events, {})
+    metadata = calculate_game_metadata(events, final_stats)
+    
+    event_counts = defaultdict(int)
+    for event in events:
+        event_counts[event.type] += 1
+    
+    return {
+        'file': file_path,
+        'events': len(events),
+        'event_types': dict(sorted(event_counts.items(), key=lambda item: item[1], reverse=True)),
+        'duration': metadata['duration'],
+        'first_blood_time': metadata['first_blood_time'],
+        'players': {
+            slot: {'account_id': info.get('account_id'), 'personaname': info.get('personaname'), 'hero_name': info.get('hero_name')}
+            for slot, info in player_info.items() if isinstance(slot, int)
+        },
+        'teams': player_info.get('_team_info')
+    }
+
 def main():
     if len(sys.argv) != 2:
         print("Usage: python convert_parsed_to_opendota.py <parsed_replay_file.json>")
@@ -535,22 +752,10 @@ def main():
     input_file = sys.argv[1]
     
     try:
-        converted_data = convert_to_opendota_format(input_file)
-        
-        # Output to stdout or save to file
-        output_file = input_file.replace('.json', '_opendota.json')
-        with open(output_file, 'w') as f:
-            json.dump(converted_data, f, indent=2)
-        
-        print(f"Conversion complete! Output saved to: {output_file}")
-        print(f"Match ID: {converted_data['match_id']}")
-        print(f"Duration: {converted_data['duration']} seconds")
-        print(f"Radiant Win: {converted_data['radiant_win']}")
-        print(f"Players: {len(converted_data['players'])}")
-        
+        convert_file(input_file)
     except Exception as e:
         print(f"Error converting file: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
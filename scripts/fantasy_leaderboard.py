@@ -0,0 +1,431 @@
+"""
+Incrementally maintain the fantasy leaderboard as matches are ingested.
+
+Instead of rescoring every game of the season (recalculate-all-fantasy-points.js),
+this keeps per-player and per-lineup running totals and game counts in a JSON
+state file. Ingesting a match only touches the ten players in it (and the
+lineups that contain them). Each applied match keeps a small record of the
+points it awarded and the lineups it credited, so re-ingesting a corrected
+match reverses exactly those credits before applying the new scores.
+
+Run it through the tools CLI: python3 scripts leaderboard <state.json> <command>
+
+Lineups are per round, as in the fantasy admin code (fantasy-enhanced-admin.ts):
+a lineup picks its players for each round, a match only counts for the
+players picked for that match's round, and totals carry over between rounds.
+"""
+
+import json
+import math
+import os
+from typing import Dict, List, Any, Optional
+
+DEFAULT_ROLE = 'Mid'  # Same fallback as recalculate-all-fantasy-points.js
+DEFAULT_DURATION_MINUTES = 40
+DEFAULT_ROUND = 'group_stage'
+
+
+def calculate_fantasy_points(player: Dict[str, Any], role: str, team_won: bool, game_duration_minutes: float) -> float:
+    """Score an OpenDota player object with the optimized equalized algorithm.
+
+    Python port of calculateFantasyPointsOptimized() from
+    recalculate-all-fantasy-points.js, reading OpenDota field names directly.
+    """
+    kills = player.get('kills') or 0
+    deaths = player.get('deaths') or 0
+    assists = player.get('assists') or 0
+    gpm = player.get('gold_per_min') or 0
+    xpm = player.get('xp_per_min') or 0
+    last_hits = player.get('last_hits') or 0
+    denies = player.get('denies') or 0
+    net_worth = player.get('net_worth') or 0
+    hero_damage = player.get('hero_damage') or 0
+    tower_damage = player.get('tower_damage') or 0
+    obs_placed = player.get('obs_placed') or 0
+    sen_placed = player.get('sen_placed') or 0
+    courier_kills = player.get('courier_kills') or 0
+    first_blood_claimed = bool(player.get('firstblood_claimed'))
+    observer_kills = player.get('observer_kills') or 0
+    sentry_kills = player.get('sentry_kills') or 0
+    hero_healing = player.get('hero_healing') or 0
+    kill_streaks = player.get('kill_streaks') or {}
+    highest_kill_streak = max((int(k) for k in kill_streaks), default=0)
+
+    points = 0.0
+
+    # === UNIVERSAL BASE SCORING ===
+    if team_won:
+        points += 5
+    if first_blood_claimed:
+        points += 12
+    points += tower_damage / 1000
+    points += observer_kills * 2.5
+    points += sentry_kills * 2.0
+    points += courier_kills * 10
+    if highest_kill_streak >= 3:
+        points += math.pow(highest_kill_streak - 2, 1.2) * 2.5
+    points += deaths * (-0.7)
+    net_worth_per_min = net_worth / game_duration_minutes
+    if net_worth_per_min > 350:
+        points += math.sqrt(net_worth_per_min - 350) / 10
+
+    # === ROLE-SPECIFIC SCORING ===
+    if role == 'Mid':
+        points += kills * 3.8
+        points += assists * 2.0
+        hero_damage_per_min = hero_damage / game_duration_minutes
+        points += hero_damage_per_min / 100
+        points += (xpm - 400) / 40
+        points += (gpm - 480) / 50
+        if assists < kills:
+            points += 12
+        if hero_damage_per_min > 500:
+            points += 8
+    elif role == 'Carry':
+        points += kills * 2.5
+        points += assists * 1.3
+        points += (gpm - 300) / 40
+        points += last_hits / game_duration_minutes / 5.5
+        points += denies / 3.5
+        if game_duration_minutes > 38:
+            points *= 1 + (game_duration_minutes - 38) / 140
+    elif role == 'Offlane':
+        points += kills * 3.0
+        points += assists * 2.8
+        total_participation = kills + assists + deaths
+        if total_participation > 0:
+            points += ((kills + assists) / total_participation) * 18
+        space_creation = math.sqrt(max(0, (kills + assists) * 2.2 - deaths - 8))
+        points += space_creation * 2
+    elif role == 'Soft Support':
+        points += kills * 1.9
+        points += assists * 2.1
+        points += obs_placed * 2.1 + sen_placed * 1.9
+        if gpm > 0:
+            points += min((kills + assists) / (gpm / 100) * 1.6, 12)
+        elif kills + assists > 0:
+            points += 12  # JS: Math.min(Infinity, 12)
+        # With gpm == 0 and no kills/assists the JS computes 0/0 and the whole
+        # score becomes NaN; here the efficiency term is simply 0.
+    elif role == 'Hard Support':
+        points += kills * 1.3
+        points += assists * 1.1
+        points += obs_placed * 2.0 + sen_placed * 1.8
+        points += hero_healing / 150
+
+    # === DURATION NORMALIZATION ===
+    points = points / min(game_duration_minutes / 40, 1.25)
+
+    # === EXCELLENCE BONUSES ===
+    kda = (kills + assists) / deaths if deaths > 0 else (kills + assists)
+    if kda >= 6:
+        points += math.pow(kda - 6, 0.7) * 2
+
+    excellence_categories = 0
+    excellence_bonuses = 0.0
+    if kills >= 12:
+        excellence_bonuses += (kills - 12) * 0.8
+        excellence_categories += 1
+    if assists >= 18:
+        excellence_bonuses += (assists - 18) * 0.3
+        excellence_categories += 1
+    if gpm >= 600:
+        excellence_bonuses += (gpm - 600) / 80
+        excellence_categories += 1
+    if hero_damage / game_duration_minutes >= 500:
+        excellence_bonuses += 4
+        excellence_categories += 1
+    if last_hits / game_duration_minutes >= 7:
+        excellence_bonuses += 2
+        excellence_categories += 1
+    if obs_placed + sen_placed >= 15:
+        excellence_bonuses += 3
+        excellence_categories += 1
+    if excellence_categories >= 3:
+        points += excellence_bonuses + excellence_categories * 3
+
+    # Perfect game bonus
+    if deaths == 0 and kills >= 5 and assists >= 10:
+        points += 15
+
+    # Match JavaScript's Math.round (half up) rather than banker's rounding
+    return math.floor(points * 100 + 0.5) / 100
+
+
+def match_round(match: Dict[str, Any]) -> str:
+    """Round a match belongs to, resolved the same way as fantasy-enhanced-admin.ts."""
+    round_id = match.get('group_id') or match.get('roundId') or match.get('round') or DEFAULT_ROUND
+    if round_id.startswith('grupa-'):
+        return DEFAULT_ROUND
+    return round_id
+
+
+def player_team_won(player: Dict[str, Any], match: Dict[str, Any]) -> bool:
+    """Work out whether the player's side won the match."""
+    if player.get('win') is not None:
+        return bool(player['win'])
+    is_radiant = player.get('isRadiant')
+    if is_radiant is None:
+        is_radiant = player.get('player_slot', 0) < 128
+    return bool(match.get('radiant_win')) == is_radiant
+
+
+class FantasyLeaderboard:
+    """Running fantasy totals backed by a JSON state file plus one file per match.
+
+    State file (<state>.json):
+        players:  account_id -> {role, total_points, games_played}
+        lineups:  lineup_id -> {total_points, games_played,
+                                rounds: {round_id -> {players: [account_id], total_points, games_played}}}
+
+    Match records (<state>_matches/<match_id>.json), one per applied match:
+        round:    round the match was scored in
+        players:  account_id -> points awarded by that match
+        lineups:  account_id -> [lineup_id, ...] the points were credited to
+
+    Match records are only read and written for the match being ingested, so
+    the award history never has to be loaded or rewritten as a whole. The
+    state file is rewritten on every save, which is O(roster + lineups) but
+    independent of how many matches the season has. Match records are written
+    before the state file.
+
+    Each record remembers exactly which lineups it credited, so re-applying or
+    removing a match reverses those credits even if lineups changed since.
+    Changing a lineup's players for a round therefore never touches its totals.
+
+    Account and match ids are stored as strings so the state round-trips
+    through JSON unchanged.
+    """
+
+    def __init__(self, state_path: Optional[str] = None):
+        self.state_path = state_path
+        self.players: Dict[str, Dict[str, Any]] = {}
+        self.lineups: Dict[str, Dict[str, Any]] = {}
+        # round_id -> account_id -> lineup ids that picked the player for that round
+        self.player_lineups: Dict[str, Dict[str, List[str]]] = {}
+        # Match records loaded or changed in this session; None marks a removed match
+        self.matches: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._dirty_matches = set()
+        if state_path and os.path.exists(state_path):
+            self.load()
+
+    @property
+    def matches_dir(self) -> Optional[str]:
+        if not self.state_path:
+            return None
+        return f"{os.path.splitext(self.state_path)[0]}_matches"
+
+    def _match_path(self, match_id: str) -> str:
+        return os.path.join(self.matches_dir, f"{match_id}.json")
+
+    def load(self):
+        with open(self.state_path, 'r') as f:
+            state = json.load(f)
+        self.players = state.get('players', {})
+        self.lineups = state.get('lineups', {})
+        self._rebuild_lineup_index()
+
+    def save(self):
+        """Write changed match records, then the state file, each atomically."""
+        if self._dirty_matches:
+            os.makedirs(self.matches_dir, exist_ok=True)
+        for match_id in sorted(self._dirty_matches):
+            match_path = self._match_path(match_id)
+            record = self.matches.get(match_id)
+            if record is None:
+                if os.path.exists(match_path):
+                    os.remove(match_path)
+            else:
+                _write_json_atomic(match_path, record)
+        self._dirty_matches.clear()
+
+        _write_json_atomic(self.state_path, {
+            'players': self.players,
+            'lineups': self.lineups,
+        })
+
+    def _match_record(self, match_id: str) -> Optional[Dict[str, Any]]:
+        if match_id not in self.matches:
+            record = None
+            if self.matches_dir and os.path.exists(self._match_path(match_id)):
+                with open(self._match_path(match_id), 'r') as f:
+                    record = json.load(f)
+            self.matches[match_id] = record
+        return self.matches[match_id]
+
+    def _rebuild_lineup_index(self):
+        self.player_lineups = {}
+        for lineup_id, lineup in self.lineups.items():
+            for round_id, lineup_round in lineup.get('rounds', {}).items():
+                round_index = self.player_lineups.setdefault(round_id, {})
+                for account_id in lineup_round.get('players', []):
+                    round_index.setdefault(str(account_id), []).append(lineup_id)
+
+    def _player_entry(self, account_id: str) -> Dict[str, Any]:
+        if account_id not in self.players:
+            self.players[account_id] = {'role': DEFAULT_ROLE, 'total_points': 0.0, 'games_played': 0}
+        return self.players[account_id]
+
+    def set_player_role(self, account_id, role: str):
+        self._player_entry(str(account_id))['role'] = role
+
+    def set_lineup(self, lineup_id: str, round_id: str, account_ids: List[Any]):
+        """Pick a lineup's players for one round.
+
+        Matches in that round ingested from now on credit the new players.
+        Points already credited stay with the lineup, so changing players
+        between (or during) rounds keeps its season total.
+        """
+        lineup_id = str(lineup_id)
+        lineup = self.lineups.setdefault(lineup_id, {'total_points': 0.0, 'games_played': 0, 'rounds': {}})
+        lineup_round = lineup['rounds'].setdefault(round_id, {'players': [], 'total_points': 0.0, 'games_played': 0})
+        lineup_round['players'] = [str(a) for a in account_ids]
+        self._rebuild_lineup_index()
+
+    def _credit(self, account_id: str, points: float, round_id: str) -> List[str]:
+        """Add one game's points to a player and the lineups that picked them this round.
+
+        Returns the ids of the credited lineups.
+        """
+        entry = self._player_entry(account_id)
+        entry['total_points'] = _round_total(entry['total_points'] + points)
+        entry['games_played'] += 1
+        credits = self.player_lineups.get(round_id, {}).get(account_id, [])
+        for lineup_id in credits:
+            lineup = self.lineups[lineup_id]
+            for totals in (lineup, lineup['rounds'][round_id]):
+                totals['total_points'] = _round_total(totals['total_points'] + points)
+                totals['games_played'] += 1
+        return list(credits)
+
+    def _reverse(self, account_id: str, points: float, round_id: str, credits: List[str]):
+        """Undo a previous _credit, touching only the lineups it credited."""
+        entry = self._player_entry(account_id)
+        entry['total_points'] = _round_total(entry['total_points'] - points)
+        entry['games_played'] -= 1
+        for lineup_id in credits:
+            lineup = self.lineups.get(lineup_id)
+            if lineup is None:
+                continue
+            for totals in (lineup, lineup['rounds'].get(round_id)):
+                if totals is not None:
+                    totals['total_points'] = _round_total(totals['total_points'] - points)
+                    totals['games_played'] -= 1
+
+    def _reverse_record(self, record: Dict[str, Any]):
+        for account_id, points in record['players'].items():
+            self._reverse(account_id, points, record['round'], record['lineups'].get(account_id, []))
+
+    def score_match(self, match: Dict[str, Any]) -> Dict[str, float]:
+        """Score every identified player in an OpenDota-format match."""
+        duration = match.get('duration') or 0
+        duration_minutes = duration / 60 if duration > 0 else DEFAULT_DURATION_MINUTES
+        scores = {}
+        for player in match.get('players', []):
+            account_id = player.get('account_id')
+            if account_id is None:
+                continue
+            account_id = str(account_id)
+            role = self.players.get(account_id, {}).get('role', DEFAULT_ROLE)
+            scores[account_id] = calculate_fantasy_points(
+                player, role, player_team_won(player, match), duration_minutes
+            )
+        return scores
+
+    def apply_match(self, match: Dict[str, Any], round_id: Optional[str] = None) -> Dict[str, float]:
+        """Apply one match, or re-apply a corrected one, returning the per-player deltas.
+
+        round_id overrides the round read from the match (converted replays
+        carry none). Only the players in this match (and the previous version
+        of it) are touched, so each ingest costs O(players in the match).
+        """
+        match_id = match.get('match_id')
+        if not match_id:
+            # The converter writes 0 when the match id can't be read from the filename
+            raise ValueError(f"Match has no usable match_id ({match_id!r}); refusing to store it")
+        match_id = str(match_id)
+
+        new_scores = self.score_match(match)
+        old_record = self._match_record(match_id)
+        old_scores = old_record['players'] if old_record else {}
+        if old_record:
+            self._reverse_record(old_record)
+
+        round_id = round_id or match_round(match)
+        record = {'round': round_id, 'players': new_scores, 'lineups': {}}
+        for account_id, points in new_scores.items():
+            credits = self._credit(account_id, points, round_id)
+            if credits:
+                record['lineups'][account_id] = credits
+
+        self.matches[match_id] = record
+        self._dirty_matches.add(match_id)
+
+        deltas = {}
+        for account_id in set(old_scores) | set(new_scores):
+            points_delta = new_scores.get(account_id, 0.0) - old_scores.get(account_id, 0.0)
+            if points_delta != 0 or (account_id in old_scores) != (account_id in new_scores):
+                deltas[account_id] = points_delta
+        return deltas
+
+    def remove_match(self, match_id) -> Dict[str, float]:
+        """Roll back everything a previously applied match contributed."""
+        match_id = str(match_id)
+        record = self._match_record(match_id)
+        if not record:
+            return {}
+        self._reverse_record(record)
+        self.matches[match_id] = None
+        self._dirty_matches.add(match_id)
+        return {account_id: -points for account_id, points in record['players'].items()}
+
+    def player_standings(self) -> List[Dict[str, Any]]:
+        standings = [
+            {
+                'account_id': account_id,
+                'role': entry['role'],
+                'total_points': round(entry['total_points'], 2),
+                'games_played': entry['games_played'],
+                'average_points': round(entry['total_points'] / entry['games_played'], 2) if entry['games_played'] else 0
+            }
+            for account_id, entry in self.players.items()
+        ]
+        return sorted(standings, key=lambda s: s['total_points'], reverse=True)
+
+    def lineup_standings(self) -> List[Dict[str, Any]]:
+        standings = [
+            {
+                'lineup_id': lineup_id,
+                'total_points': round(lineup['total_points'], 2),
+                'games_played': lineup['games_played'],
+                'rounds': {round_id: round(lineup_round['total_points'], 2)
+                           for round_id, lineup_round in lineup['rounds'].items()},
+                'average_points': round(lineup['total_points'] / lineup['games_played'], 2) if lineup['games_played'] else 0
+            }
+            for lineup_id, lineup in self.lineups.items()
+        ]
+        return sorted(standings, key=lambda s: s['total_points'], reverse=True)
+
+
+def _round_total(total: float) -> float:
+    """Scores have two decimals, so totals do too; rounding drops the float residue
+    that apply-then-remove would otherwise leave behind (e.g. 3.55e-15)."""
+    return round(total, 2) + 0.0
+
+
+def _write_json_atomic(path: str, data: Any):
+    """Write JSON via a temp file so an interrupted run never leaves half a file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def load_match(file_path: str) -> Dict[str, Any]:
+    """Load a converted match, converting a raw parsed replay on the fly if needed."""
+    if file_path.endswith('_opendota.json'):
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    from convert_parsed_to_opendota import convert_to_opendota_format
+    return convert_to_opendota_format(file_path)
+
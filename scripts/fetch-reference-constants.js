@@ -0,0 +1,41 @@
+// This script fetches the OpenDota item and ability id constants used by the replay converter
+// (scripts/reference_data.py) and writes them to item_ids.json and ability_ids.json.
+// Usage: node scripts/fetch-reference-constants.js
+
+const fs = require('fs');
+const https = require('https');
+
+const CONSTANTS_URL = 'https://api.opendota.com/api/constants';
+const RESOURCES = {
+  item_ids: 'item_ids.json',       // id -> item name, e.g. "1": "blink"
+  ability_ids: 'ability_ids.json'  // id -> ability name, e.g. "5069": "puck_illusory_orb"
+};
+
+function fetchConstant(resource, outputPath) {
+  https.get(`${CONSTANTS_URL}/${resource}`, (res) => {
+    let data = '';
+    res.on('data', chunk => { data += chunk; });
+    res.on('end', () => {
+      try {
+        const constants = JSON.parse(data);
+        if (constants && typeof constants === 'object' && !Array.isArray(constants)) {
+          fs.writeFileSync(outputPath, JSON.stringify(constants, null, 2));
+          console.log(`${resource}: ${Object.keys(constants).length} entries written to ${outputPath}`);
+        } else {
+          console.error(`Unexpected response for ${resource}:`, constants);
+          process.exitCode = 1;
+        }
+      } catch (e) {
+        console.error(`Failed to parse ${resource}:`, e);
+        process.exitCode = 1;
+      }
+    });
+  }).on('error', (err) => {
+    console.error(`Error fetching ${resource}:`, err);
+    process.exitCode = 1;
+  });
+}
+
+for (const [resource, outputPath] of Object.entries(RESOURCES)) {
+  fetchConstant(resource, outputPath);
+}
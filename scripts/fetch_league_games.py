@@ -4,12 +4,14 @@ Fetch all games played in the tournament (Dota 2 league) using the Steam API.
 League ID is imported from the codebase definitions.
 """
 
-import requests
 import json
 import time
 from typing import List, Dict, Optional
 import os
-from dotenv import load_dotenv
+import sys
+
+# requests and python-dotenv are imported where they are used, so importing this
+# module (e.g. from the tools CLI) stays cheap for offline work.
 
 # You can update this import path if you want to fetch the ID from your TS file automatically
 LEAGUE_ID = 18559  # from src/lib/definitions.ts
@@ -20,6 +22,7 @@ class Dota2LeagueFetcher:
         self.base_url = "https://api.steampowered.com"
 
     def get_league_matches(self, league_id: int, matches_requested: int = 100) -> List[Dict]:
+        import requests
         url = f"{self.base_url}/IDOTA2Match_570/GetMatchHistory/v1/"
         params = {
             'key': self.api_key,
@@ -41,6 +44,7 @@ class Dota2LeagueFetcher:
             return []
 
     def get_all_league_matches(self, league_id: int) -> List[Dict]:
+        import requests
         all_matches = []
         start_at_match_id = None
         while True:
@@ -74,6 +78,7 @@ class Dota2LeagueFetcher:
         return all_matches
 
     def get_match_details(self, match_id: int) -> Optional[Dict]:
+        import requests
         url = f"{self.base_url}/IDOTA2Match_570/GetMatchDetails/v1/"
         params = {
             'key': self.api_key,
@@ -100,6 +105,7 @@ class Dota2LeagueFetcher:
         print(f"Saved {len(match_ids)} match_ids to {filename}")
 
     def get_league_info(self, league_id: int) -> Optional[Dict]:
+        import requests
         url = f"{self.base_url}/IDOTA2Match_570/GetLeagueListing/v1/"
         params = {
             'key': self.api_key,
@@ -122,16 +128,28 @@ class Dota2LeagueFetcher:
             print(f"Error fetching league info: {e}")
             return None
 
-if __name__ == "__main__":
-    # Load environment variables from .env.local
+def load_env():
+    """Load environment variables from .env.local in the repository root."""
+    from dotenv import load_dotenv
     load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env.local'))
+
+def main(league_id: int = LEAGUE_ID, matches_requested: int = 100) -> int:
+    """Fetch league match ids and save them; returns a process exit code."""
+    load_env()
     API_KEY = os.getenv("NEXT_PUBLIC_STEAM_API_KEY")
     if not API_KEY:
-        raise RuntimeError("NEXT_PUBLIC_STEAM_API_KEY not found in .env.local!")
-    # League ID from definitions
-    LEAGUE_ID = 18559
+        print("Error: NEXT_PUBLIC_STEAM_API_KEY not found in .env.local!")
+        return 1
     fetcher = Dota2LeagueFetcher(API_KEY)
-    print(f"Fetching matches for league {LEAGUE_ID}...")
-    matches = fetcher.get_league_matches(LEAGUE_ID, matches_requested=100)
+    print(f"Fetching matches for league {league_id}...")
+    matches = fetcher.get_league_matches(league_id, matches_requested=matches_requested)
+    if not matches:
+        # get_league_matches returns [] on request/API errors; don't overwrite a previous id list
+        print(f"Error: no matches fetched for league {league_id}")
+        return 1
     print(f"Found {len(matches)} matches")
-    fetcher.save_match_ids_to_file(matches, f"league_{LEAGUE_ID}_matches.json")
+    fetcher.save_match_ids_to_file(matches, f"league_{league_id}_matches.json")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,30 +2,47 @@
 """
 Fetch full match object from OpenDota for a given match ID.
 """
-import requests
 import json
 import os
-from dotenv import load_dotenv
+import sys
+from typing import Optional
 
 MATCH_ID = 8423006415
+REQUEST_TIMEOUT = 30  # seconds; full match objects can be a few MB
 
-# Load OpenDota API key from .env.local if available
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env.local'))
-OPENDOTA_API_KEY = os.getenv("OPENDOTA_API_KEY")
+def fetch_match(match_id: int = MATCH_ID, out_file: Optional[str] = None) -> bool:
+    """Download a match from OpenDota and save it as opendota_match_<id>.json."""
+    import requests
+    from dotenv import load_dotenv
 
-url = f"https://api.opendota.com/api/matches/{MATCH_ID}"
-headers = {}
-params = {}
-if OPENDOTA_API_KEY:
-    params['api_key'] = OPENDOTA_API_KEY
+    # Load OpenDota API key from .env.local if available
+    load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env.local'))
+    OPENDOTA_API_KEY = os.getenv("OPENDOTA_API_KEY")
 
-print(f"Fetching match {MATCH_ID} from OpenDota...")
-response = requests.get(url, headers=headers, params=params)
-if response.status_code == 200:
-    match_data = response.json()
-    out_file = f"opendota_match_{MATCH_ID}.json"
-    with open(out_file, 'w') as f:
-        json.dump(match_data, f, indent=2)
-    print(f"Match data saved to {out_file}")
-else:
-    print(f"Failed to fetch match: {response.status_code} {response.text}")
+    url = f"https://api.opendota.com/api/matches/{match_id}"
+    headers = {}
+    params = {}
+    if OPENDOTA_API_KEY:
+        params['api_key'] = OPENDOTA_API_KEY
+
+    print(f"Fetching match {match_id} from OpenDota...")
+    try:
+        response = requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching match {match_id}: {e}")
+        return False
+    if response.status_code == 200:
+        match_data = response.json()
+        out_file = out_file or f"opendota_match_{match_id}.json"
+        with open(out_file, 'w') as f:
+            json.dump(match_data, f, indent=2)
+        print(f"Match data saved to {out_file}")
+        return True
+    else:
+        print(f"Failed to fetch match: {response.status_code} {response.text}")
+        return False
+
+if __name__ == "__main__":
+    match_id = int(sys.argv[1]) if len(sys.argv) > 1 else MATCH_ID
+    if not fetch_match(match_id):
+        sys.exit(1)
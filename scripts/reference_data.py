@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Name -> id lookups for heroes, items and abilities, used while converting parsed replays.
+
+The index is built from the reference JSON files in the repository root:
+  - hero-data.json   (OpenDota heroes constants: id -> {name: 'npc_dota_hero_*', localized_name})
+  - hero_data.json   (id -> localized name, written by scripts/fetch-hero-data.js)
+  - item_ids.json    (OpenDota constants/item_ids: id -> 'blink')
+  - ability_ids.json (OpenDota constants/ability_ids: id -> 'puck_illusory_orb')
+
+item_ids.json and ability_ids.json are written by scripts/fetch-reference-constants.js.
+Without them every item id resolves to 0 and no ability ids resolve at all.
+
+Parsing those files on every conversion is wasted work, so the built index is
+cached as a JSON snapshot in .cache/ at the repository root (gitignored).
+The snapshot holds only the name -> id tables, so loading it runs no code.
+The snapshot records the size and mtime of every source file and is rebuilt
+as soon as any of them change, or if it can't be read for any reason.
+"""
+
+import json
+import os
+import sys
+from typing import Dict, List, Any, Optional
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HERO_SOURCES = ['hero-data.json', 'hero_data.json']
+CONSTANTS_SOURCES = ['item_ids.json', 'ability_ids.json']
+SNAPSHOT_PATH = os.path.join(REPO_ROOT, '.cache', 'reference_index.json')
+SNAPSHOT_VERSION = 3
+
+HERO_PREFIX = 'npc_dota_hero_'
+ITEM_PREFIX = 'item_'
+
+_index = None
+
+
+def normalize_hero_name(name: str) -> str:
+    """Reduce 'npc_dota_hero_anti_mage', 'Anti-Mage' etc. to a single lookup key."""
+    key = name.strip().lower()
+    if key.startswith(HERO_PREFIX):
+        key = key[len(HERO_PREFIX):]
+    return key.replace(' ', '_').replace('-', '_').replace("'", '')
+
+
+def normalize_item_name(name: str) -> str:
+    """Combat log uses 'item_blink', OpenDota purchase logs use 'blink'."""
+    key = name.strip().lower()
+    if key.startswith(ITEM_PREFIX):
+        key = key[len(ITEM_PREFIX):]
+    return key
+
+
+class ReferenceIndex:
+    """Prebuilt hero, item and ability lookup tables."""
+
+    __slots__ = ('hero_ids', 'item_ids', 'ability_ids')
+
+    def __init__(self, hero_ids: Dict[str, int], item_ids: Dict[str, int], ability_ids: Dict[str, int]):
+        self.hero_ids = hero_ids
+        self.item_ids = item_ids
+        self.ability_ids = ability_ids
+
+    def hero_id(self, name: Optional[str]) -> Optional[int]:
+        if not name:
+            return None
+        return self.hero_ids.get(normalize_hero_name(name))
+
+    def item_id(self, name: Optional[str]) -> int:
+        """Item id for a name, or 0 (OpenDota's empty slot) if unknown."""
+        if not name:
+            return 0
+        return self.item_ids.get(normalize_item_name(name), 0)
+
+    def ability_id(self, name: Optional[str]) -> Optional[int]:
+        if not name:
+            return None
+        return self.ability_ids.get(name.strip().lower())
+
+
+def _source_paths(root: str) -> List[str]:
+    return [os.path.join(root, name) for name in HERO_SOURCES + CONSTANTS_SOURCES]
+
+
+def _source_signature(root: str) -> List:
+    """[path, size, mtime] for every source file; missing files are recorded as None.
+
+    Lists rather than tuples so the signature compares equal after a JSON round trip.
+    """
+    signature = [SNAPSHOT_VERSION]
+    for path in _source_paths(root):
+        try:
+            stat = os.stat(path)
+            signature.append([path, stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            signature.append([path, None, None])
+    return signature
+
+
+def _load_json(path: str) -> Any:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"Warning: Failed to load reference data {path}: {e}", file=sys.stderr)
+        return None
+
+
+def build_reference_index(root: str = REPO_ROOT) -> ReferenceIndex:
+    """Build the index straight from the source JSON files."""
+    hero_ids = {}
+
+    heroes = _load_json(os.path.join(root, 'hero-data.json')) or {}
+    for hero_id, hero in heroes.items():
+        for name in (hero.get('name'), hero.get('localized_name')):
+            if name:
+                hero_ids[normalize_hero_name(name)] = int(hero_id)
+
+    localized = _load_json(os.path.join(root, 'hero_data.json')) or {}
+    for hero_id, name in localized.items():
+        if name:
+            hero_ids.setdefault(normalize_hero_name(name), int(hero_id))
+
+    item_ids = {}
+    items = _load_json(os.path.join(root, 'item_ids.json')) or {}
+    for item_id, name in items.items():
+        if name:
+            item_ids[normalize_item_name(name)] = int(item_id)
+
+    ability_ids = {}
+    abilities = _load_json(os.path.join(root, 'ability_ids.json')) or {}
+    for ability_id, name in abilities.items():
+        if name:
+            ability_ids[name.strip().lower()] = int(ability_id)
+
+    for name, table in (('item_ids.json', item_ids), ('ability_ids.json', ability_ids)):
+        if not table:
+            print(f"Warning: {name} not found in {root}; run node scripts/fetch-reference-constants.js", file=sys.stderr)
+
+    return ReferenceIndex(hero_ids, item_ids, ability_ids)
+
+
+def _read_snapshot(signature: List) -> Optional[ReferenceIndex]:
+    try:
+        with open(SNAPSHOT_PATH, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if snapshot.get('signature') != signature:
+            return None
+        return ReferenceIndex(snapshot['hero_ids'], snapshot['item_ids'], snapshot['ability_ids'])
+    except Exception:
+        # Missing, truncated, stale or foreign snapshot: rebuild from the JSON sources
+        return None
+
+
+def _write_snapshot(signature: List, index: ReferenceIndex):
+    snapshot = {
+        'signature': signature,
+        'hero_ids': index.hero_ids,
+        'item_ids': index.item_ids,
+        'ability_ids': index.ability_ids
+    }
+    tmp_path = f"{SNAPSHOT_PATH}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(SNAPSHOT_PATH), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except OSError as e:
+        # A read-only checkout still works, it just rebuilds the index every run
+        print(f"Warning: Could not write reference index snapshot: {e}", file=sys.stderr)
+
+
+def get_reference_index(refresh: bool = False) -> ReferenceIndex:
+    """Return the process-wide index, loading it from the snapshot when it is still fresh."""
+    global _index
+    if _index is not None and not refresh:
+        return _index
+
+    signature = _source_signature(REPO_ROOT)
+    index = None if refresh else _read_snapshot(signature)
+    if index is None:
+        index = build_reference_index(REPO_ROOT)
+        _write_snapshot(signature, index)
+    _index = index
+    return _index
+
+
+def main():
+    index = get_reference_index(refresh='--refresh' in sys.argv)
+    print(f"Reference index: {len(set(index.hero_ids.values()))} heroes, {len(index.item_ids)} items, {len(index.ability_ids)} abilities")
+    print(f"Snapshot: {SNAPSHOT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
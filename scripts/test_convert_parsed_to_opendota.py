@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the purchase, ability upgrade and inventory output of convert_parsed_to_opendota.py.
+
+Run from the repository root: python3 -m unittest scripts/test_convert_parsed_to_opendota.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import reference_data
+from convert_parsed_to_opendota import (
+    ReplayEvent, expand_ability_upgrades, expand_final_inventory, expand_purchases, extract_combat_stats,
+    extract_player_slots
+)
+
+PLAYER_INFO = {0: {'hero_name': 'npc_dota_hero_puck'}, 5: {'hero_name': 'npc_dota_hero_axe'}}
+
+
+def combat_stats_for(raw_events):
+    return extract_combat_stats([ReplayEvent(raw) for raw in raw_events], PLAYER_INFO)
+
+
+def purchase(time, item, hero='npc_dota_hero_puck', cost=0):
+    return {'type': 'DOTA_COMBATLOG_PURCHASE', 'time': time, 'targetname': hero, 'valuename': item, 'value': cost}
+
+
+def ability_level(ability, hero='npc_dota_hero_puck'):
+    return {'type': 'DOTA_ABILITY_LEVEL', 'time': 0, 'targetname': hero, 'valuename': ability}
+
+
+class ReferenceRootTestCase(unittest.TestCase):
+    """Points the reference index at a temporary root holding the given constants files."""
+
+    constants = {}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for name, table in self.constants.items():
+            with open(os.path.join(self.tmp.name, name), 'w') as f:
+                json.dump(table, f)
+        patcher = mock.patch.multiple(
+            reference_data, REPO_ROOT=self.tmp.name, _index=None,
+            SNAPSHOT_PATH=os.path.join(self.tmp.name, '.cache', os.path.basename(reference_data.SNAPSHOT_PATH)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+
+class ExtractPlayerSlotsTest(unittest.TestCase):
+
+    def test_events_without_key_or_value_are_skipped(self):
+        events = [ReplayEvent(raw) for raw in (
+            {'type': 'player_slot', 'key': '0', 'value': 0},
+            {'type': 'player_slot', 'key': '7', 'value': 132},
+            {'type': 'player_slot', 'key': '3'},
+            {'type': 'player_slot', 'value': 4},
+        )]
+        self.assertEqual(extract_player_slots(events), {0: 0, 7: 132})
+
+
+class ExpandPurchasesTest(unittest.TestCase):
+
+    def test_purchase_log_first_purchase_time_and_counts(self):
+        combat_stats = combat_stats_for([
+            purchase(-85, 'item_tango', cost=90),
+            purchase(-80, 'item_ward_observer'),
+            purchase(-80, 'item_tango', cost=90),
+            purchase(312, 'item_bottle', cost=675),
+            purchase(-40, 'item_branches', hero='npc_dota_hero_axe', cost=50),
+        ])
+        purchases = expand_purchases(combat_stats[0], combat_stats['_names'])
+
+        self.assertEqual(purchases['purchase_log'], [
+            {'time': -85, 'key': 'tango'},
+            {'time': -80, 'key': 'ward_observer'},
+            {'time': -80, 'key': 'tango'},
+            {'time': 312, 'key': 'bottle'},
+        ])
+        self.assertEqual(purchases['first_purchase_time'], {'tango': -85, 'ward_observer': -80, 'bottle': 312})
+        self.assertEqual(purchases['purchase'], {'tango': 2, 'ward_observer': 1, 'bottle': 1})
+        self.assertEqual(combat_stats[0]['gold_spent'], 855)
+
+    def test_player_without_purchases(self):
+        combat_stats = combat_stats_for([purchase(0, 'item_branches', hero='npc_dota_hero_axe')])
+        self.assertEqual(expand_purchases(combat_stats[0], combat_stats['_names']),
+                         {'purchase_log': [], 'first_purchase_time': {}, 'purchase': {}})
+
+
+class ExpandAbilityUpgradesTest(ReferenceRootTestCase):
+
+    constants = {'ability_ids.json': {'5069': 'puck_illusory_orb', '5070': 'puck_waning_rift'}}
+
+    def test_upgrades_resolve_in_skill_order(self):
+        combat_stats = combat_stats_for([
+            ability_level('puck_illusory_orb'),
+            ability_level('puck_waning_rift'),
+            ability_level('puck_illusory_orb'),
+            ability_level('axe_berserkers_call', hero='npc_dota_hero_axe'),
+        ])
+        self.assertEqual(expand_ability_upgrades(combat_stats[0], combat_stats['_names']), [5069, 5070, 5069])
+
+    def test_unknown_abilities_are_dropped(self):
+        combat_stats = combat_stats_for([
+            ability_level('puck_illusory_orb'),
+            ability_level('special_bonus_unknown'),
+            ability_level('puck_waning_rift'),
+        ])
+        self.assertEqual(expand_ability_upgrades(combat_stats[0], combat_stats['_names']), [5069, 5070])
+
+
+class ExpandFinalInventoryTest(ReferenceRootTestCase):
+
+    constants = {'item_ids.json': {'1': 'blink', '29': 'boots', '36': 'magic_wand', '1575': 'mysterious_hat'}}
+
+    def test_slots_come_from_last_interval_hero_inventory(self):
+        inventory = expand_final_inventory({'hero_inventory': [
+            {'id': 'item_blink', 'slot': 0},
+            {'id': 'item_boots', 'slot': 2},
+            {'id': 'item_magic_wand', 'slot': 7},
+            {'id': 'item_mysterious_hat', 'slot': 16},
+            {'id': 'item_not_in_constants', 'slot': 3},
+        ]})
+        self.assertEqual(inventory, {
+            'item_0': 1, 'item_1': 0, 'item_2': 29, 'item_3': 0, 'item_4': 0, 'item_5': 0,
+            'backpack_0': 0, 'backpack_1': 36, 'backpack_2': 0, 'item_neutral': 1575
+        })
+
+    def test_entries_without_slot_use_list_position(self):
+        inventory = expand_final_inventory({'hero_inventory': [{'id': 'item_boots'}, {'id': 'item_blink'}]})
+        self.assertEqual((inventory['item_0'], inventory['item_1']), (29, 1))
+
+    def test_missing_hero_inventory_leaves_slots_empty(self):
+        self.assertEqual(set(expand_final_inventory({'kills': 3}).values()), {0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for fantasy_leaderboard.py.
+
+Run from the repository root: python3 -m unittest scripts/test_fantasy_leaderboard.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fantasy_leaderboard import FantasyLeaderboard, calculate_fantasy_points, match_round
+
+# (role, team_won, duration_minutes, OpenDota player fields, calculateFantasyPointsOptimized() result)
+# Expected values come from running the function in recalculate-all-fantasy-points.js under Node
+# with the same stats mapped to its camelCase performance fields.
+JS_PARITY_CASES = [
+    ('Mid', True, 37.9, {'kills': 25, 'deaths': 1, 'assists': 15, 'gold_per_min': 870, 'xp_per_min': 1128,
+                         'last_hits': 369, 'denies': 8, 'net_worth': 30309, 'hero_damage': 38130,
+                         'tower_damage': 9550, 'hero_healing': 26353, 'firstblood_claimed': 1,
+                         'kill_streaks': {'3': 2, '7': 1}}, 294.2),
+    ('Carry', False, 45.5, {'kills': 8, 'deaths': 6, 'assists': 5, 'gold_per_min': 640, 'xp_per_min': 700,
+                            'last_hits': 420, 'denies': 12, 'net_worth': 26000, 'hero_damage': 21000,
+                            'tower_damage': 4000}, 38.34),
+    ('Offlane', True, 32.0, {'kills': 6, 'deaths': 4, 'assists': 14, 'gold_per_min': 420, 'xp_per_min': 520,
+                             'last_hits': 120, 'denies': 3, 'net_worth': 13000, 'hero_damage': 19000,
+                             'tower_damage': 1500, 'courier_kills': 1}, 122.45),
+    ('Soft Support', False, 41.0, {'kills': 3, 'deaths': 9, 'assists': 17, 'gold_per_min': 290, 'xp_per_min': 400,
+                                   'last_hits': 40, 'net_worth': 7000, 'hero_damage': 9000, 'obs_placed': 9,
+                                   'sen_placed': 8, 'observer_kills': 2, 'sentry_kills': 3}, 89.01),
+    # gpm == 0 with kills/assists: the JS caps Infinity at 12
+    ('Soft Support', True, 30.0, {'kills': 2, 'deaths': 3, 'assists': 10}, 52.93),
+    ('Hard Support', True, 52.0, {'kills': 1, 'deaths': 0, 'assists': 22, 'gold_per_min': 250, 'xp_per_min': 330,
+                                  'last_hits': 20, 'net_worth': 6000, 'hero_damage': 7000, 'hero_healing': 9000,
+                                  'obs_placed': 12, 'sen_placed': 10}, 120.53),
+]
+
+
+def make_match(match_id, kills_by_account, radiant_win=True, round_id=None):
+    players = []
+    for slot, (account_id, kills) in enumerate(kills_by_account.items()):
+        players.append({
+            'account_id': account_id,
+            'player_slot': slot if slot < 5 else slot + 123,
+            'kills': kills, 'deaths': 2, 'assists': 5,
+            'gold_per_min': 500, 'xp_per_min': 550, 'last_hits': 150, 'net_worth': 15000,
+        })
+    match = {'match_id': match_id, 'duration': 2400, 'radiant_win': radiant_win, 'players': players}
+    if round_id:
+        match['round'] = round_id
+    return match
+
+
+class CalculateFantasyPointsTest(unittest.TestCase):
+
+    def test_matches_javascript_scoring(self):
+        for role, team_won, minutes, player, expected in JS_PARITY_CASES:
+            with self.subTest(role=role, expected=expected):
+                self.assertEqual(calculate_fantasy_points(player, role, team_won, minutes), expected)
+
+    def test_soft_support_without_gold_or_participation_is_finite(self):
+        # The JS scores this NaN (0/0); the port treats the efficiency term as 0
+        points = calculate_fantasy_points({'deaths': 1}, 'Soft Support', False, 30.0)
+        self.assertEqual(points, -0.93)
+
+
+class FantasyLeaderboardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmp.name, 'state.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_corrected_match_reverses_original_lineup_credits(self):
+        board = FantasyLeaderboard(self.state_path)
+        board.apply_match(make_match(1, {100: 10, 101: 3}))
+        board.set_lineup('L', 'group_stage', ['100', '101'])
+
+        board.apply_match(make_match(1, {100: 12, 101: 3}))
+        self.assertEqual(board.lineups['L']['games_played'], 2)
+
+        board.remove_match(1)
+        self.assertEqual(board.lineups['L']['games_played'], 0)
+        self.assertAlmostEqual(board.lineups['L']['total_points'], 0.0)
+        self.assertEqual(board.players['100']['games_played'], 0)
+        self.assertAlmostEqual(board.players['100']['total_points'], 0.0)
+
+    def test_removing_every_match_leaves_exact_zero_totals(self):
+        board = FantasyLeaderboard(self.state_path)
+        board.set_lineup('L', 'group_stage', ['100', '101'])
+        for match_id in range(1, 6):
+            board.apply_match(make_match(match_id, {100: 10 + match_id, 101: 3}))
+        for match_id in range(1, 6):
+            board.remove_match(match_id)
+
+        self.assertEqual(board.lineups['L']['total_points'], 0.0)
+        self.assertEqual(board.players['100']['total_points'], 0.0)
+        self.assertEqual(board.players['101']['total_points'], 0.0)
+        self.assertEqual(board.lineups['L']['rounds']['group_stage']['total_points'], 0.0)
+
+    def test_reapplying_same_match_is_idempotent(self):
+        board = FantasyLeaderboard(self.state_path)
+        board.set_lineup('L', 'group_stage', ['100'])
+        board.apply_match(make_match(1, {100: 10, 101: 3}))
+        before = json.dumps([board.players, board.lineups], sort_keys=True)
+        deltas = board.apply_match(make_match(1, {100: 10, 101: 3}))
+        self.assertEqual(deltas, {})
+        self.assertEqual(json.dumps([board.players, board.lineups], sort_keys=True), before)
+
+    def test_lineup_change_between_rounds_keeps_season_total(self):
+        board = FantasyLeaderboard(self.state_path)
+        board.set_lineup('L', 'group_stage', ['100'])
+        board.apply_match(make_match(1, {100: 10, 101: 3}))
+        group_stage_points = board.lineups['L']['total_points']
+
+        board.set_lineup('L', 'playoffs_round1', ['101'])
+        scores = board.apply_match(make_match(2, {100: 10, 101: 3}, round_id='playoffs_round1'))
+
+        lineup = board.lineups['L']
+        self.assertEqual(lineup['games_played'], 2)
+        self.assertEqual(lineup['rounds']['group_stage']['total_points'], group_stage_points)
+        self.assertEqual(lineup['rounds']['playoffs_round1']['total_points'], scores['101'])
+        self.assertAlmostEqual(lineup['total_points'], group_stage_points + scores['101'])
+
+    def test_lineup_change_within_round_keeps_credited_points(self):
+        board = FantasyLeaderboard(self.state_path)
+        board.set_lineup('L', 'group_stage', ['100'])
+        board.apply_match(make_match(1, {100: 10, 101: 3}))
+        board.set_lineup('L', 'group_stage', ['101'])
+        scores = board.apply_match(make_match(2, {100: 10, 101: 3}))
+        self.assertEqual(board.lineups['L']['games_played'], 2)
+
+        # Reversal follows the match records, not the current picks
+        board.remove_match(1)
+        self.assertEqual(board.lineups['L']['games_played'], 1)
+        self.assertEqual(board.lineups['L']['total_points'], scores['101'])
+
+    def test_match_round_follows_fantasy_admin_rules(self):
+        self.assertEqual(match_round({}), 'group_stage')
+        self.assertEqual(match_round({'group_id': 'grupa-a'}), 'group_stage')
+        self.assertEqual(match_round({'roundId': 'playoffs_round2'}), 'playoffs_round2')
+
+    def test_rejects_missing_match_id(self):
+        board = FantasyLeaderboard(self.state_path)
+        for match_id in (None, 0):
+            with self.assertRaises(ValueError):
+                board.apply_match(make_match(match_id, {100: 10}))
+        self.assertEqual(board.players, {})
+
+    def test_match_records_persist_per_match(self):
+        board = FantasyLeaderboard(self.state_path)
+        board.set_lineup('L', 'group_stage', ['100'])
+        board.apply_match(make_match(1, {100: 10}))
+        board.apply_match(make_match(2, {100: 4}))
+        board.save()
+
+        with open(self.state_path) as f:
+            self.assertNotIn('matches', json.load(f))
+        self.assertEqual(sorted(os.listdir(board.matches_dir)), ['1.json', '2.json'])
+
+        reloaded = FantasyLeaderboard(self.state_path)
+        reloaded.remove_match(1)
+        reloaded.save()
+        self.assertEqual(os.listdir(reloaded.matches_dir), ['2.json'])
+        self.assertEqual(reloaded.players['100']['games_played'], 1)
+        self.assertEqual(reloaded.lineups['L']['games_played'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the reference index snapshot in reference_data.py.
+
+Run from the repository root: python3 -m unittest scripts/test_reference_data.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import reference_data
+from reference_data import get_reference_index
+
+
+class ReferenceSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.snapshot_path = os.path.join(self.root, '.cache', 'reference_index.json')
+        patcher = mock.patch.multiple(reference_data, REPO_ROOT=self.root, SNAPSHOT_PATH=self.snapshot_path, _index=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+        self.write_source('hero-data.json', {'1': {'name': 'npc_dota_hero_antimage', 'localized_name': 'Anti-Mage'}})
+        self.write_source('item_ids.json', {'1': 'blink'})
+        self.write_source('ability_ids.json', {'5069': 'puck_illusory_orb'})
+
+    def write_source(self, name, data, mtime_ns=None):
+        path = os.path.join(self.root, name)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def load(self):
+        reference_data._index = None
+        return get_reference_index()
+
+    def test_fresh_snapshot_is_used_without_reading_sources(self):
+        self.assertEqual(self.load().hero_id('Anti-Mage'), 1)
+        self.assertTrue(os.path.exists(self.snapshot_path))
+
+        with mock.patch.object(reference_data, 'build_reference_index') as build:
+            index = self.load()
+        build.assert_not_called()
+        self.assertEqual(index.item_id('item_blink'), 1)
+        self.assertEqual(index.ability_id('puck_illusory_orb'), 5069)
+
+    def test_rebuilds_when_source_size_changes(self):
+        self.assertEqual(self.load().item_id('blink'), 1)
+        self.write_source('item_ids.json', {'1': 'blink', '29': 'boots'})
+        self.assertEqual(self.load().item_id('boots'), 29)
+
+    def test_rebuilds_when_source_mtime_changes(self):
+        self.write_source('item_ids.json', {'1': 'blink'}, mtime_ns=1_000_000_000)
+        self.assertEqual(self.load().item_id('blink'), 1)
+
+        # Same size, different contents: only the mtime tells them apart
+        self.write_source('item_ids.json', {'2': 'blink'}, mtime_ns=2_000_000_000)
+        self.assertEqual(self.load().item_id('blink'), 2)
+
+    def test_rebuilds_when_a_source_appears(self):
+        os.remove(os.path.join(self.root, 'ability_ids.json'))
+        self.assertIsNone(self.load().ability_id('puck_illusory_orb'))
+        self.write_source('ability_ids.json', {'5069': 'puck_illusory_orb'})
+        self.assertEqual(self.load().ability_id('puck_illusory_orb'), 5069)
+
+    def test_unreadable_snapshot_is_rebuilt(self):
+        os.makedirs(os.path.dirname(self.snapshot_path))
+        with open(self.snapshot_path, 'w') as f:
+            f.write('[1, 2')
+        self.assertEqual(self.load().hero_id('npc_dota_hero_antimage'), 1)
+        with open(self.snapshot_path) as f:
+            self.assertIn('hero_ids', json.load(f))
+
+
+if __name__ == "__main__":
+    unittest.main()